@@ -9,34 +9,46 @@ image with the results.
 import asyncio
 import logging
 import os
-from datetime import datetime, timezone
 import subprocess
+import time
+from operator import itemgetter
 from tempfile import TemporaryDirectory
 import xml.etree.ElementTree as ET
 
-from fedora_image_uploader_messages.publish import AzurePublishedV1
 from fedora_messaging import config, api
 from fedora_messaging.exceptions import ValidationError, PublishTimeout, ConnectionException
 
 from fedora_cloud_tests_messages.publish import AzureTestResults
 
-from .trigger_lisa import LisaRunner
+from .trigger_lisa import LisaResult, LisaRunner
 
 _log = logging.getLogger(__name__)
 
+# Topic of the AzurePublishedV1 messages sent by fedora-image-uploader, without the
+# environment prefix (e.g. "org.fedoraproject.prod.") or the per-image suffix
+_AZURE_PUBLISHED_TOPIC = "fedora_image_uploader.published.v1.azure"
+
+# ssh-keygen arguments for a passphrase-less ed25519 key, the key path is appended
+_SSH_KEYGEN_COMMAND = ("ssh-keygen", "-t", "ed25519", "-N", "", "-f")
+
+# Fields copied from the AzurePublishedV1 body into the test results message
+_IMAGE_METADATA = itemgetter(
+    "architecture", "compose_id", "image_definition_name", "image_resource_id"
+)
+
 
 class AzurePublishedConsumer:
     """Consumer class for AzurePublishedV1 messages to trigger LISA tests."""
 
     # Supported Fedora versions for testing
-    SUPPORTED_FEDORA_VERSIONS = [
+    SUPPORTED_FEDORA_VERSIONS = frozenset({
         "Fedora-Cloud-Rawhide-x64",
         "Fedora-Cloud-41-x64",
         "Fedora-Cloud-41-Arm64",
         "Fedora-Cloud-Rawhide-Arm64",
         "Fedora-Cloud-42-x64",
         "Fedora-Cloud-42-Arm64",
-        ]
+        })
 
     def __init__(self):
         try:
@@ -44,10 +56,18 @@ class AzurePublishedConsumer:
         except KeyError:
             _log.error("The Azure consumer requires an 'azure' config section")
             raise
+        # The SSH key pair is generated on first use and reused for every test run
+        self._ssh_key_dir = None
+        self._private_key = None
 
     def __call__(self, message):
-        """Callback method to handle incoming messages."""
-        _log.info("Received message: %s", message)
+        """Callback method to handle incoming messages.
+
+        fedora-messaging delivers messages with basic.consume and only acknowledges
+        a message once this method returns, so the broker will not hand us more
+        messages than the configured prefetch_count while a LISA run is in progress.
+        """
+        _log.info("Received message %s", message.id)
         self.azure_published_callback(message)
 
     def _get_image_definition_name(self, message):
@@ -75,7 +95,7 @@ class AzurePublishedConsumer:
 
     def get_community_gallery_image(self, message):
         """Extract community gallery image from the messages."""
-        _log.info(
+        _log.debug(
             "Extracting community gallery image from the message: %s", message.body
         )
         try:
@@ -103,7 +123,7 @@ class AzurePublishedConsumer:
                 return None
 
             # Defensive split and validation
-            parts = image_resource_id.split("/")
+            parts = image_resource_id.split("/", 3)
             if len(parts) < 3:
                 _log.error(
                     "image_resource_id format is invalid: %s", image_resource_id
@@ -129,14 +149,11 @@ class AzurePublishedConsumer:
     def azure_published_callback(self, message):
         """Handle Azure published messages"""
         _log.info("Received message on topic: %s", message.topic)
-        _log.info("Message %s", message.body)
-        try:
-            if isinstance(message, AzurePublishedV1):
-                _log.info("Message properties match AzurePublishedV1 schema.")
-        except TypeError as e:
-            _log.error(
-                "Message properties do not match AzurePublishedV1 schema: %s", str(e)
-            )
+        _log.debug("Message %s", message.body)
+        # Allow any environment prefix, but only match whole dot-separated segments
+        if f".{_AZURE_PUBLISHED_TOPIC}." not in f".{message.topic}.":
+            _log.warning("Ignoring message on unexpected topic: %s", message.topic)
+            return
 
         community_gallery_image = self.get_community_gallery_image(message)
 
@@ -148,7 +165,7 @@ class AzurePublishedConsumer:
         image_definition_name = self._get_image_definition_name(message)
 
         # Generate run name with UTC format
-        run_name = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%MZ")
+        run_name = time.strftime("%Y-%m-%dT%H:%MZ", time.gmtime())
         _log.info("Run name generated: %s", run_name)
 
         try:
@@ -160,16 +177,17 @@ class AzurePublishedConsumer:
             ) as log_path:
                 _log.info("Temporary log path created: %s", log_path)
 
-                # Generate SSH key pair for authentication
-                private_key = self._generate_ssh_key_pair(log_path)
+                # Get the SSH key pair for authentication
+                private_key = self._get_private_key()
 
                 config_params = {
                     "subscription": self.conf["subscription_id"],
                     "private_key": private_key,
                     "log_path": log_path,
                     "run_name": run_name,
+                    "timeout": self.conf.get("lisa_timeout"),
                 }
-                _log.info("LISA config parameters: %s", config_params)
+                _log.debug("LISA config parameters: %s", config_params)
                 _log.info("Triggering tests for image: %s", community_gallery_image)
                 runner = LisaRunner()
                 ret = asyncio.run(
@@ -179,22 +197,26 @@ class AzurePublishedConsumer:
                         config=config_params
                     )
                 )
-                _log.info("LISA trigger completed with return code: %d", ret)
-                if ret == 0:
+                _log.info("LISA trigger completed with result: %s", ret)
+                if ret is LisaResult.OK:
                     _log.info("LISA trigger executed successfully.")
                     test_results = self._parse_test_results(log_path, run_name)
                     if test_results is not None:
-                        _log.info("Test execution completed with results: %s", test_results)
+                        _log.info("Test execution completed for image: %s", image_definition_name)
+                        _log.debug("Test results: %s", test_results)
                         # To Do: Implement sending the results using publisher
                         self.publish_test_results(message, test_results)
                     else:
                         _log.error("Failed to parse test results, skipping image")
                 else:
-                    _log.error("LISA trigger failed with return code: %d", ret)
+                    _log.error("LISA trigger failed with result: %s", ret)
                 # TemporaryDirectory automatically cleans up when exiting the context
 
         except OSError as e:
             _log.exception("Failed to trigger LISA: %s", str(e))
+        except Exception:  # pylint: disable=broad-except
+            # Don't let one image's failure take down the consumer and requeue the message
+            _log.exception("Unexpected error while testing image %s, skipping it", image_definition_name)
 
     def publish_test_results(self, message, test_results):
         """
@@ -238,15 +260,17 @@ class AzurePublishedConsumer:
             dict: Message body for AzureTestResults
         """
         # Extract image metadata from original message
-        body = original_message.body
+        architecture, compose_id, image_definition_name, image_resource_id = _IMAGE_METADATA(
+            original_message.body
+        )
 
         # Build the result message body following the schema
         result_body = {
             # Image identification
-            "architecture": body["architecture"],
-            "compose_id": body["compose_id"],
-            "image_id": body["image_definition_name"],  # Use definition name as image ID
-            "image_resource_id": body["image_resource_id"],
+            "architecture": architecture,
+            "compose_id": compose_id,
+            "image_id": image_definition_name,  # Use definition name as image ID
+            "image_resource_id": image_resource_id,
 
             # Detailed test lists
             "failed_tests": test_results.get("failed_tests", {"count": 0, "tests": {}}),
@@ -310,51 +334,57 @@ class AzurePublishedConsumer:
 
         test_suites = root.findall("testsuite") if root.tag == "testsuites" else [root]
 
+        # Bind the per-testcase lookups once, this loop runs for every test in the run
+        remove_html_tags = self._remove_html_tags
+        add_passed = test_details['passed'].append
+        add_failed = test_details['failed'].append
+        add_skipped = test_details['skipped'].append
+
         # Iterate through test suites and test cases
         for suite in test_suites:
             suite_name = suite.attrib.get('name')
 
             for testcase in suite.findall('testcase'):
-                test_name = testcase.attrib.get('name')
+                attrib = testcase.attrib
+                find = testcase.find
 
                 # Create a descriptive test identifier
-                test_identifier = f"{suite_name}.{test_name}"
-                test_time = testcase.attrib.get('time', '0.000')
+                test_identifier = f"{suite_name}.{attrib.get('name')}"
 
                 # Check test status and extract the message if available
-                failure_elem = testcase.find('failure')
-                error_elem = testcase.find('error')
-                skipped_elem = testcase.find('skipped')
+                failure_elem = find('failure')
+                error_elem = find('error')
+                skipped_elem = find('skipped')
 
                 # Log test details for failed, skipped and errored tests
                 if failure_elem is not None:
-                    failure_msg = failure_elem.attrib.get('message', 'Test case failed')
-                    failure_msg = self._remove_html_tags(failure_msg)
-                    traceback_msg = failure_elem.text or ''
+                    failure_msg = remove_html_tags(failure_elem.attrib.get('message', 'Test case failed'))
+                    traceback_msg = (failure_elem.text or '').strip()
 
                     # Combine failure_message and traceback if available
-                    if traceback_msg.strip():
-                        failure_msg = f"Summary: {failure_msg}\n Traceback: \n{traceback_msg.strip()}"
-                    test_details['failed'].append((test_identifier, failure_msg))
+                    if traceback_msg:
+                        failure_msg = f"Summary: {failure_msg}\n Traceback: \n{traceback_msg}"
+                    add_failed((test_identifier, failure_msg))
 
                 elif error_elem is not None:
-                    error_msg = error_elem.attrib.get('message', 'Test error')
-                    error_msg = self._remove_html_tags(error_msg)
-                    traceback_msg = error_elem.text or ''
-                    if traceback_msg.strip():
-                        error_msg = f"Summary: {error_msg}\n Traceback: \n{traceback_msg.strip()}"
-                    test_details['failed'].append((test_identifier, error_msg))
+                    error_msg = remove_html_tags(error_elem.attrib.get('message', 'Test error'))
+                    traceback_msg = (error_elem.text or '').strip()
+                    if traceback_msg:
+                        error_msg = f"Summary: {error_msg}\n Traceback: \n{traceback_msg}"
+                    add_failed((test_identifier, error_msg))
 
                 elif skipped_elem is not None:
-                    skip_msg = skipped_elem.attrib.get('message', 'Test skipped')
-                    skip_msg = self._remove_html_tags(skip_msg)
-
                     # As there won't be any traceback will return the entire message
-                    test_details['skipped'].append((test_identifier, skip_msg))
+                    add_skipped((
+                        test_identifier,
+                        remove_html_tags(skipped_elem.attrib.get('message', 'Test skipped')),
+                    ))
 
                 else:
-                    passed_msg = f"Test passed in {test_time} seconds."
-                    test_details['passed'].append((test_identifier, passed_msg))
+                    add_passed((
+                        test_identifier,
+                        f"Test passed in {attrib.get('time', '0.000')} seconds.",
+                    ))
 
         _log.info("Extracted test details - Passed: %d, Failed: %d, Skipped: %d",
                   len(test_details['passed']),
@@ -421,6 +451,41 @@ class AzurePublishedConsumer:
         _log.warning("No XML file with suffix 'lisa.junit.xml' found in %s", xml_path)
         return None
 
+    def _get_private_key(self):
+        """
+        Get the SSH private key used to access the test VMs.
+
+        The key pair is generated once per consumer process rather than per message,
+        since each LISA run deploys fresh VMs and has no need for a unique key.
+
+        Returns:
+            str: Path to the private key file, or None if generation fails.
+        """
+        if self._private_key is not None and not os.path.exists(self._private_key):
+            # Something (e.g. systemd-tmpfiles) cleaned up the key under a long-running consumer
+            _log.warning("SSH private key %s no longer exists, generating a new one", self._private_key)
+            self.close()
+        if self._private_key is None:
+            if self._ssh_key_dir is None:
+                # Lives as long as the consumer; nothing calls close() on shutdown, so it
+                # is removed by the TemporaryDirectory finalizer when the process exits
+                self._ssh_key_dir = TemporaryDirectory(  # pylint: disable=consider-using-with
+                    prefix="lisa_ssh_key_", ignore_cleanup_errors=True
+                )
+            self._private_key = self._generate_ssh_key_pair(self._ssh_key_dir.name)
+            if self._private_key is None:
+                # ssh-keygen won't overwrite a key left behind by a failed attempt, so
+                # start the next attempt in a fresh directory
+                self.close()
+        return self._private_key
+
+    def close(self):
+        """Remove the SSH key pair generated for the test VMs, if there is one."""
+        if self._ssh_key_dir is not None:
+            self._ssh_key_dir.cleanup()
+            self._ssh_key_dir = None
+        self._private_key = None
+
     def _generate_ssh_key_pair(self, temp_dir):
         """
         Generate an SSH key pair for authentication.
@@ -437,8 +502,11 @@ class AzurePublishedConsumer:
 
         try:
             # Generate SSH key pair using ssh-keygen
-            cmd = ["ssh-keygen", "-t", "ed25519", "-f", private_key_path, "-N", ""]
-            ret = subprocess.run(cmd, check=True, capture_output=True, text=True, timeout=60)
+            cmd = (*_SSH_KEYGEN_COMMAND, private_key_path)
+            # No stdin, so an unexpected prompt fails straight away instead of hanging
+            ret = subprocess.run(
+                cmd, check=True, capture_output=True, text=True, timeout=60, stdin=subprocess.DEVNULL
+            )
             _log.info("SSH key pair generated at: %s and %s", private_key_path, public_key_path)
             _log.debug("ssh-keygen output: %s", ret.stdout)
 
@@ -450,6 +518,6 @@ class AzurePublishedConsumer:
             # Set the permissions for the file
             os.chmod(private_key_path, 0o600)
             return private_key_path
-        except (subprocess.CalledProcessError, OSError) as e:
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired, OSError) as e:
             _log.error("Failed to generate SSH key pair: %s", str(e))
             return None
@@ -1,23 +1,74 @@
 """Module to trigger LISA tests asynchronously."""
 
 import asyncio
+import enum
 import logging
+import shlex
 import subprocess
 
 _log = logging.getLogger(__name__)
 
+# Default number of seconds to wait for a LISA run before terminating it
+DEFAULT_TIMEOUT = 3 * 60 * 60
+# Number of seconds to wait for LISA to exit after asking it to terminate
+TERMINATE_GRACE_PERIOD = 30
+# Default maximum number of LISA processes LisaRunner.run_many runs at once
+DEFAULT_CONCURRENCY = 8
+# Longest line of LISA output, in bytes, that is read and logged; longer lines are skipped
+OUTPUT_LINE_LIMIT = 1024 * 1024
+
+# Config keys trigger_lisa needs a non-empty value for, in the order they are checked
+_REQUIRED_CONFIG_KEYS = ("subscription", "private_key")
+
+# The LISA runbook, test tier and test case a LisaRunner uses unless told otherwise
+DEFAULT_RUNBOOK = "microsoft/runbook/azure_fedora.yml"
+DEFAULT_TIER = 1
+DEFAULT_TEST_CASE = "verify_dhcp_file_configuration"
+
+
+class LisaResult(enum.Enum):
+    """The outcome of a trigger_lisa run.
+
+    Only OK is truthy, so callers that treated the old True/False return value as
+    success/failure keep working.
+    """
+
+    OK = enum.auto()
+    # The region, image or config passed to trigger_lisa was invalid
+    VALIDATION = enum.auto()
+    # LISA could not be started
+    SUBPROCESS_ERROR = enum.auto()
+    # LISA ran but exited with a non-zero return code
+    NONZERO_EXIT = enum.auto()
+    # LISA did not finish within the timeout and was terminated
+    TIMEOUT = enum.auto()
+
+    def __bool__(self):
+        return self is LisaResult.OK
+
 
-# pylint: disable=too-few-public-methods
 class LisaRunner:
-    """Class to run LISA tests asynchronously"""
+    """Class to run LISA tests asynchronously
+
+    Args:
+        runbook (str): The LISA runbook to run.
+        tier (int): The test tier to select from the runbook.
+        test_case (str): The name of the test case to run, or None to run every
+            test case in the tier.
+    """
 
-    def __init__(self):
-        pass
+    def __init__(self, runbook=DEFAULT_RUNBOOK, tier=DEFAULT_TIER, test_case=DEFAULT_TEST_CASE):
+        self.runbook = runbook
+        self.tier = tier
+        self.test_case = test_case
+        # The part of the LISA command line that is the same for every run
+        self._base_command = ("lisa", "-r", runbook, "-v", f"tier:{tier}")
+        if test_case:
+            self._base_command += ("-v", f"test_case_name:{test_case}")
 
     async def trigger_lisa(
         self, region, community_gallery_image, config):
-        # pylint: disable=too-many-return-statements,too-many-branches
-        """Trigger LISA tier 1 tests with the provided parameters.
+        """Trigger the runner's LISA tests with the provided parameters.
 
         Args:
             region (str): The Azure region to run the tests in.
@@ -27,84 +78,187 @@ class LisaRunner:
                 - private_key (str): The path to the private key file for authentication.
                 - log_path (str): The path to the log file for the LISA tests.
                 - run_name (str): The name of the test run.
+                - timeout (int, optional): Seconds to wait for LISA to finish before
+                  terminating it. Defaults to DEFAULT_TIMEOUT.
+
+        Returns:
+            LisaResult: LisaResult.OK if the LISA test completed successfully (return code 0),
+                otherwise the member describing why it did not.
+        """
+        error = self._validate_parameters(region, community_gallery_image, config)
+        if error:
+            _log.error(error)
+            return LisaResult.VALIDATION
+
+        subscription = config.get("subscription")
+        private_key = config.get("private_key")
+        log_path = config.get("log_path")
+        run_name = config.get("run_name")
+        timeout = config.get("timeout") or DEFAULT_TIMEOUT
+
+        try:
+            command = self._build_command(
+                region, community_gallery_image, subscription, private_key, log_path, run_name
+            )
+            if _log.isEnabledFor(logging.INFO):
+                _log.info("Starting LISA test with command: %s", shlex.join(command))
+            # LISA stays in the consumer's process group so that a Ctrl-C in the
+            # consumer's terminal reaches it too
+            process = await asyncio.create_subprocess_exec(
+                *command,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                limit=OUTPUT_LINE_LIMIT,
+            )
+            try:
+                await asyncio.wait_for(self._stream_output(process), timeout=timeout)
+            except asyncio.TimeoutError:
+                _log.error("LISA test did not finish within %s seconds, terminating it", timeout)
+                await self._terminate(process)
+                return LisaResult.TIMEOUT
+            except BaseException:
+                # Cancelled, or failed while reading the output: don't leave LISA running
+                _log.warning("LISA test was interrupted, terminating it")
+                await self._terminate(process)
+                raise
+
+            if process.returncode == 0:
+                _log.info("LISA test completed successfully")
+                return LisaResult.OK
+            _log.error("LISA test failed with return code: %d", process.returncode)
+            return LisaResult.NONZERO_EXIT
+        except OSError as e:
+            _log.error("An error occurred while running the tests: %s", e)
+            return LisaResult.SUBPROCESS_ERROR
+
+    @classmethod
+    async def run_many(cls, jobs, concurrency=DEFAULT_CONCURRENCY, **runner_kwargs):
+        """Run several LISA test runs concurrently on the current event loop.
+
+        Callers with more than one image to test should await this once rather
+        than creating a new event loop for each run.
+
+        Args:
+            jobs (list): (region, community_gallery_image, config) tuples, one per run,
+                with the same meaning as the trigger_lisa arguments.
+            concurrency (int): The maximum number of LISA processes to run at once.
+            runner_kwargs: Passed to the LisaRunner constructor to choose the runbook,
+                tier and test case used for every job.
+
+        Returns:
+            list: The LisaResult for each job, in the same order as jobs. If a run raised
+                an unexpected exception, the exception is returned in its place so that
+                the other runs still complete.
+        """
+        runner = cls(**runner_kwargs)
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run_one(region, image, config):
+            async with semaphore:
+                return await runner.trigger_lisa(region, image, config)
+
+        return await asyncio.gather(
+            *(run_one(region, image, config) for region, image, config in jobs),
+            return_exceptions=True,
+        )
+
+    def _build_command(  # pylint: disable=too-many-arguments,too-many-positional-arguments
+        self, region, community_gallery_image, subscription, private_key, log_path=None, run_name=None
+    ):
+        """Build the LISA command line for one run from already validated parameters.
+
+        Returns:
+            list: The LISA executable followed by its arguments.
+        """
+        variables = [
+            f"region:{region}",
+            f"community_gallery_image:{community_gallery_image}",
+            f"subscription_id:{subscription}",
+            f"admin_private_key_file:{private_key}",
+        ]
+        command = [
+            *self._base_command,
+            *(arg for var in variables for arg in ("-v", var)),
+        ]
+
+        # Add optional parameters only if they are provided
+        if log_path:
+            command.extend(["-l", log_path])
+            _log.debug("Added log path: %s", log_path)
+        else:
+            _log.debug("No log path provided, using LISA default")
+
+        if run_name:
+            command.extend(["-i", run_name])
+            _log.debug("Added run name: %s", run_name)
+        else:
+            _log.debug("No run name provided, using LISA default")
+
+        return command
+
+    def _validate_parameters(self, region, community_gallery_image, config):
+        """Check the trigger_lisa parameters before anything is built or started.
 
         Returns:
-            bool: True if the LISA test completed successfully (return code 0),
-                  False if the test failed, had errors, or if required parameters are missing.
+            str: A description of the first invalid parameter, or None if they are all valid.
         """
-        # Validate the input parameters
         if not region or not isinstance(region, str):
-            _log.error("Invalid region parameter: must be a non-empty string")
-            return False
+            return "Invalid region parameter: must be a non-empty string"
 
         if not community_gallery_image or not isinstance(community_gallery_image, str):
-            _log.error(
-                "Invalid community_gallery_image parameter: must be a non-empty string"
-            )
-            return False
+            return "Invalid community_gallery_image parameter: must be a non-empty string"
 
         if not isinstance(config, dict):
-            _log.error("Invalid config parameter: must be a dictionary")
-            return False
+            return "Invalid config parameter: must be a dictionary"
 
-        if not config.get("subscription"):
-            _log.error("Missing required parameter: subscription")
-            return False
+        for key in _REQUIRED_CONFIG_KEYS:
+            if not config.get(key):
+                return f"Missing required parameter: {key}"
 
-        if not config.get("private_key"):
-            _log.error("Missing required parameter: private_key")
-            return False
+        return None
 
-        try:
-            variables = [
-                f"region:{region}",
-                f"community_gallery_image:{community_gallery_image}",
-                f"subscription_id:{config.get('subscription')}",
-                f"admin_private_key_file:{config.get('private_key')}",
-            ]
-            command = [
-                "lisa",
-                "-r", "microsoft/runbook/azure_fedora.yml",
-                "-v", "tier:1",
-                "-v", "test_case_name:verify_dhcp_file_configuration",
-            ]
-            for var in variables:
-                command.extend(["-v", var])
-
-            # Add optional parameters only if they are provided
-            log_path = config.get("log_path")
-            if log_path:
-                command.extend(["-l", log_path])
-                _log.debug("Added log path: %s", log_path)
-            else:
-                _log.debug("No log path provided, using LISA default")
-
-            run_name = config.get("run_name")
-            if run_name:
-                command.extend(["-i", run_name])
-                _log.debug("Added run name: %s", run_name)
-            else:
-                _log.debug("No run name provided, using LISA default")
-
-            _log.info("Starting LISA test with command: %s", " ".join(command))
-            process = await asyncio.create_subprocess_exec(
-                *command,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT
-            )
-            async for line in process.stdout:
-                line_content = line.decode().strip()
+    async def _stream_output(self, process):
+        """Log the LISA output as it arrives and wait for the process to exit."""
+        # When nothing would be logged, drain the pipe without decoding each line
+        log_output = _log.isEnabledFor(logging.INFO)
+        # Set while discarding the rest of a line longer than OUTPUT_LINE_LIMIT
+        skipping = False
+        while True:
+            at_eof = False
+            try:
+                line = await process.stdout.readuntil(b"\n")
+            except asyncio.IncompleteReadError as e:
+                # End of the output, which may not end with a newline
+                line, at_eof = e.partial, True
+            except asyncio.LimitOverrunError as e:
+                if not skipping:
+                    _log.warning("Skipping a line of LISA output longer than %d bytes", OUTPUT_LINE_LIMIT)
+                    skipping = True
+                # Throw away what has been buffered of the line so far and keep reading
+                await process.stdout.readexactly(e.consumed)
+                continue
+
+            if skipping:
+                # This is the tail end of the over-long line
+                skipping = False
+            elif log_output:
+                line_content = line.decode(errors="replace").strip()
                 if line_content:  # Only log non-empty lines
                     _log.info("LISA OUTPUT: %s ", line_content)
+            if at_eof:
+                break
 
-            await process.wait()
-            # stderr = await process.communicate()
+        await process.wait()
 
-            if process.returncode == 0:
-                _log.info("LISA test completed successfully")
-                return True
-            _log.error("LISA test failed with return code: %d", process.returncode)
-            return False
-        except Exception as e:  # pylint: disable=broad-except
-            _log.error("An error occurred while running the tests: %s", str(e))
-            return False
+    async def _terminate(self, process):
+        """Terminate the LISA process, killing it if it does not exit in time."""
+        try:
+            process.terminate()
+            try:
+                await asyncio.wait_for(process.wait(), timeout=TERMINATE_GRACE_PERIOD)
+            except asyncio.TimeoutError:
+                _log.warning("LISA did not exit after %s seconds, killing it", TERMINATE_GRACE_PERIOD)
+                process.kill()
+                await process.wait()
+        except ProcessLookupError:
+            _log.debug("LISA process %d has already exited", process.pid)
@@ -25,7 +25,7 @@ class AzureTestResults(BaseTestResults):
     """
     Published when an image is tested with LISA and results are available.
     """
-    topic = ".".join([BaseTestResults.topic, "azure"])
+    topic = f"{BaseTestResults.topic}.azure"
 
     body_schema = {
         "id": f"{SCHEMA_URL}/{topic}.json",
@@ -0,0 +1,47 @@
+"""Shared fixtures for the fedora_cloud_tests_messages tests."""
+
+from types import MappingProxyType
+
+import pytest
+
+from fedora_cloud_tests_messages.publish import AzureTestResults, BaseTestResults
+
+
+@pytest.fixture(scope="session")
+def azure_schema():
+    """The AzureTestResults message body schema."""
+    return AzureTestResults.body_schema
+
+
+@pytest.fixture(scope="session")
+def base_instance():
+    """A BaseTestResults instance created without running Message.__init__."""
+    return BaseTestResults.__new__(BaseTestResults)
+
+
+@pytest.fixture(scope="session")
+def valid_body():
+    """
+    A valid AzureTestResults message body.
+
+    The body is shared across the session and read-only; tests that need a variant
+    should copy it with ``dict(valid_body)`` and replace the fields they exercise.
+    """
+    return MappingProxyType({
+        "architecture": "x86_64",
+        "compose_id": "Fedora-41-20241001.n.0",
+        "image_id": "Fedora-Cloud-41-x64",
+        "image_resource_id": "/subscriptions/test/resourceGroups/test/providers/Microsoft.Compute/galleries/test",
+        "failed_tests": {
+            "count": 0,
+            "tests": {}
+        },
+        "skipped_tests": {
+            "count": 0,
+            "tests": {}
+        },
+        "passed_tests": {
+            "count": 1,
+            "tests": {"Provisioning.smoke_test": "Test passed in 46.198 seconds"}
+        }
+    })
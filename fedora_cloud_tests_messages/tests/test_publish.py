@@ -19,11 +19,9 @@ class TestBaseTestResults:
         expected_topic = "fedora_cloud_tests.test_results.v1"
         assert BaseTestResults.topic == expected_topic
 
-    def test_app_name_property(self):
+    def test_app_name_property(self, base_instance):
         """Test that app_name property returns correct value."""
-        # Test the class property directly - it's a property that returns a string
-        class_instance = BaseTestResults.__new__(BaseTestResults)
-        assert class_instance.app_name == "fedora_cloud_tests"
+        assert base_instance.app_name == "fedora_cloud_tests"
 
 
 class TestAzureTestResults:
@@ -34,6 +32,28 @@ class TestAzureTestResults:
         expected_topic = "fedora_cloud_tests.test_results.v1.azure"
         assert AzureTestResults.topic == expected_topic
 
+    def test_body_schema_is_valid_draft7(self, azure_schema):
+        """Test that the body schema itself is a valid Draft 7 schema."""
+        jsonschema.Draft7Validator.check_schema(azure_schema)
+
+    @pytest.mark.parametrize(
+        "field,expected_type",
+        [
+            ("architecture", "string"),
+            ("compose_id", "string"),
+            ("image_id", "string"),
+            ("image_resource_id", "string"),
+        ],
+    )
+    def test_schema_property_types(self, field, expected_type, azure_schema):
+        """Test the declared type of each image metadata property."""
+        assert azure_schema["properties"][field]["type"] == expected_type
+
+    @pytest.mark.parametrize("field", ["failed_tests", "skipped_tests", "passed_tests"])
+    def test_schema_test_results_properties(self, field, azure_schema):
+        """Test that each test results property uses the shared testResults definition."""
+        assert azure_schema["properties"][field] == {"$ref": "#/$defs/testResults"}
+
     def test_schema_validation_missing_required_fields(self):
         """Test schema validation fails with missing required fields."""
         incomplete_body = {
@@ -45,86 +65,38 @@ class TestAzureTestResults:
             message = AzureTestResults(body=incomplete_body)
             message.validate()
 
-    def test_schema_validation_wrong_data_types(self):
+    def test_schema_validation_wrong_data_types(self, valid_body):
         """Test schema validation fails with wrong data types."""
-        invalid_body = {
-            "architecture": "x86_64",
-            "compose_id": "Fedora-Rawhide-20250922.n.0",
-            "image_id": "Fedora-Cloud-Rawhide-x64",
-            "image_resource_id": "/subscriptions/test-sub/resourceGroups/test-rg/providers/Microsoft.Compute/galleries/test-gallery",
-            "passed_tests": "not_an_object",  # Should be object with count and tests
-            "failed_tests": {
-                "count": 1,
-                "tests": {"Dhcp.verify_dhcp_client_timeout": "DHCP client timeout configuration issue"}
-            },
-            "skipped_tests": {
-                "count": 1,
-                "tests": {"GpuTestSuite.verify_load_gpu_driver": "No available quota found on 'westus3'"}
-            }
-        }
+        invalid_body = dict(valid_body)
+        invalid_body["passed_tests"] = "not_an_object"  # Should be object with count and tests
 
         with pytest.raises(jsonschema.ValidationError):
             message = AzureTestResults(body=invalid_body)
             message.validate()
 
-    def test_schema_validation_invalid_test_objects(self):
+    def test_schema_validation_invalid_test_objects(self, valid_body):
         """Test schema validation fails with invalid test result objects."""
-        invalid_body = {
-            "architecture": "x86_64",
-            "compose_id": "Fedora-Rawhide-20250922.n.0",
-            "image_id": "Fedora-Cloud-Rawhide-x64",
-            "image_resource_id": "/subscriptions/test-sub/resourceGroups/test-rg/providers/Microsoft.Compute/galleries/test-gallery",
-            "passed_tests": {
-                "count": 1,
-                "tests": {"AzureImageStandard.verify_grub": "Test passed in 5.494 seconds"}
-            },
-            "failed_tests": {
-                "count": "not_a_number",  # Should be integer
-                "tests": {"Storage.verify_swap": "Swap configuration from waagent.conf and distro should match"}
-            },
-            "skipped_tests": {
-                "count": 1,
-                "tests": {"ACCBasicTest.verify_sgx": "No available quota found on 'westus3'"}
-            }
+        invalid_body = dict(valid_body)
+        invalid_body["failed_tests"] = {
+            "count": "not_a_number",  # Should be integer
+            "tests": {"Storage.verify_swap": "Swap configuration from waagent.conf and distro should match"}
         }
 
         with pytest.raises(jsonschema.ValidationError):
             message = AzureTestResults(body=invalid_body)
             message.validate()
 
-    def test_message_string_representation(self):
+    def test_message_string_representation(self, valid_body):
         """Test the __str__ method of AzureTestResults."""
-        valid_body = {
-            "architecture": "x86_64",
-            "compose_id": "Fedora-41-20241001.n.0",
-            "image_id": "Fedora-Cloud-41-x64",
-            "image_resource_id": "/subscriptions/test/resourceGroups/test/providers/Microsoft.Compute/galleries/test",
-            "failed_tests": {
-                "count": 0,
-                "tests": {}
-            },
-            "skipped_tests": {
-                "count": 0,
-                "tests": {}
-            },
-            "passed_tests": {
-                "count": 1,
-                "tests": {"Provisioning.smoke_test": "Test passed in 46.198 seconds"}
-            }
-        }
-
-        message = AzureTestResults(body=valid_body)
+        message = AzureTestResults(body=dict(valid_body))
         str_repr = str(message)
         assert "AzureImageTestResults for Fedora-Cloud-41-x64" == str_repr
 
-    def test_message_summary_property(self):
+    def test_message_summary_property(self, valid_body):
         """Test the summary property of AzureTestResults."""
         # Using realistic test counts from LISA XML data (91 total: 58 passed, 8 failed, 25 skipped)
-        valid_body = {
-            "architecture": "x86_64",
-            "compose_id": "Fedora-41-20241001.n.0",
-            "image_id": "Fedora-Cloud-41-x64",
-            "image_resource_id": "/subscriptions/test/resourceGroups/test/providers/Microsoft.Compute/galleries/test",
+        body = {
+            **valid_body,
             "failed_tests": {
                 "count": 8,
                 "tests": {
@@ -159,7 +131,7 @@ class TestAzureTestResults:
             }
         }
 
-        message = AzureTestResults(body=valid_body)
+        message = AzureTestResults(body=body)
         summary = message.summary
 
         # Check that summary contains test counts matching LISA results
@@ -172,13 +144,10 @@ class TestAzureTestResults:
 class TestSchemaIntegration:
     """Integration tests for schema functionality."""
 
-    def test_create_valid_message_body_example(self):
+    def test_create_valid_message_body_example(self, valid_body):
         """Example of how to create a properly formatted message body with real LISA test names."""
         valid_message_body = {
-            "architecture": "x86_64",
-            "compose_id": "Fedora-41-20241001.n.0",
-            "image_id": "Fedora-Cloud-41-x64",
-            "image_resource_id": "/subscriptions/test/resourceGroups/test/providers/Microsoft.Compute/galleries/test",
+            **valid_body,
             "failed_tests": {
                 "count": 3,
                 "tests": {
@@ -224,26 +193,13 @@ class TestSchemaIntegration:
         assert "3 tests failed" in summary
         assert "4 tests skipped" in summary
 
-    def test_test_results_object_validation(self):
+    def test_test_results_object_validation(self, valid_body):
         """Test validation of test results object structure."""
         # Test missing required fields in test results object
-        invalid_body_missing_count = {
-            "architecture": "x86_64",
-            "compose_id": "Fedora-41-20241001.n.0",
-            "image_id": "Fedora-Cloud-41-x64",
-            "image_resource_id": "/subscriptions/test/resourceGroups/test/providers/Microsoft.Compute/galleries/test",
-            "failed_tests": {
-                # Missing "count" field
-                "tests": {"Vdso.verify_vdso": "Current distro Fedora doesn't support vdsotest"}
-            },
-            "skipped_tests": {
-                "count": 0,
-                "tests": {}
-            },
-            "passed_tests": {
-                "count": 0,
-                "tests": {}
-            }
+        invalid_body_missing_count = dict(valid_body)
+        invalid_body_missing_count["failed_tests"] = {
+            # Missing "count" field
+            "tests": {"Vdso.verify_vdso": "Current distro Fedora doesn't support vdsotest"}
         }
 
         with pytest.raises(jsonschema.ValidationError):
@@ -251,52 +207,26 @@ class TestSchemaIntegration:
             message.validate()
 
         # Test missing required fields in test results object
-        invalid_body_missing_tests = {
-            "architecture": "x86_64",
-            "compose_id": "Fedora-41-20241001.n.0",
-            "image_id": "Fedora-Cloud-41-x64",
-            "image_resource_id": "/subscriptions/test/resourceGroups/test/providers/Microsoft.Compute/galleries/test",
-            "failed_tests": {
-                "count": 1,
-                # Missing "tests" field
-            },
-            "skipped_tests": {
-                "count": 0,
-                "tests": {}
-            },
-            "passed_tests": {
-                "count": 0,
-                "tests": {}
-            }
+        invalid_body_missing_tests = dict(valid_body)
+        invalid_body_missing_tests["failed_tests"] = {
+            "count": 1,
+            # Missing "tests" field
         }
 
         with pytest.raises(jsonschema.ValidationError):
             message = AzureTestResults(body=invalid_body_missing_tests)
             message.validate()
 
-    def test_valid_edge_cases(self):
+    def test_valid_edge_cases(self, valid_body):
         """Test valid edge cases that should pass validation."""
         # Test with only passed tests
-        only_passed_body = {
-            "architecture": "x86_64",
-            "compose_id": "Fedora-41-20241001.n.0",
-            "image_id": "Fedora-Cloud-41-x64",
-            "image_resource_id": "/subscriptions/test/resourceGroups/test/providers/Microsoft.Compute/galleries/test",
-            "failed_tests": {
-                "count": 0,
-                "tests": {}
-            },
-            "skipped_tests": {
-                "count": 0,
-                "tests": {}
-            },
-            "passed_tests": {
-                "count": 3,
-                "tests": {
-                    "Provisioning.smoke_test": "Test passed in 46.198 seconds",
-                    "Dns.verify_dns_name_resolution": "Test passed in 8.379 seconds",
-                    "KernelDebug.verify_enable_kprobe": "Test passed in 10.013 seconds"
-                }
+        only_passed_body = dict(valid_body)
+        only_passed_body["passed_tests"] = {
+            "count": 3,
+            "tests": {
+                "Provisioning.smoke_test": "Test passed in 46.198 seconds",
+                "Dns.verify_dns_name_resolution": "Test passed in 8.379 seconds",
+                "KernelDebug.verify_enable_kprobe": "Test passed in 10.013 seconds"
             }
         }
 
@@ -305,10 +235,10 @@ class TestSchemaIntegration:
 
         # Test with only failed tests
         only_failed_body = {
+            **valid_body,
             "architecture": "aarch64",
             "compose_id": "Fedora-Rawhide-20241015.n.0",
             "image_id": "Fedora-Cloud-Rawhide-Arm64",
-            "image_resource_id": "/subscriptions/test/resourceGroups/test/providers/Microsoft.Compute/galleries/test",
             "failed_tests": {
                 "count": 2,
                 "tests": {
@@ -316,10 +246,6 @@ class TestSchemaIntegration:
                     "Storage.verify_swap": "Swap configuration from waagent.conf and distro should match"
                 }
             },
-            "skipped_tests": {
-                "count": 0,
-                "tests": {}
-            },
             "passed_tests": {
                 "count": 0,
                 "tests": {}
@@ -1,8 +1,10 @@
 """Unit tests for the AzurePublishedConsumer class in azure.py."""
 
 import os
+import shutil
 import subprocess
-from tempfile import TemporaryDirectory
+import xml.etree.ElementTree as ET
+from types import SimpleNamespace
 from unittest.mock import patch, MagicMock, Mock
 
 import pytest
@@ -10,6 +12,7 @@ from fedora_image_uploader_messages.publish import AzurePublishedV1
 from fedora_messaging import config as fm_config
 
 from fedora_cloud_tests.azure import AzurePublishedConsumer
+from fedora_cloud_tests.trigger_lisa import LisaResult
 
 @pytest.fixture(scope="module")
 def azure_conf():
@@ -28,7 +31,17 @@ def azure_conf():
 @pytest.fixture
 def consumer(azure_conf):  # pylint: disable=unused-argument
     """Create an AzurePublishedConsumer instance for testing."""
-    return AzurePublishedConsumer()
+    consumer = AzurePublishedConsumer()
+    yield consumer
+    consumer.close()
+
+
+def fake_ssh_keygen(temp_dir):
+    """Stand in for _generate_ssh_key_pair by writing an empty key file to temp_dir."""
+    private_key_path = os.path.join(temp_dir, "id_ed25519")
+    with open(private_key_path, "w", encoding="utf-8"):
+        pass
+    return private_key_path
 
 
 @pytest.fixture
@@ -50,16 +63,17 @@ class TestAzurePublishedConsumer:
 
     def test_supported_fedora_versions_constant(self):
         """Test that SUPPORTED_FEDORA_VERSIONS contains expected versions."""
-        # Test that the constant is defined and is a list
+        # Test that the constant is defined and is a frozenset
         assert hasattr(AzurePublishedConsumer, 'SUPPORTED_FEDORA_VERSIONS')
-        assert isinstance(AzurePublishedConsumer.SUPPORTED_FEDORA_VERSIONS, list)
+        assert isinstance(AzurePublishedConsumer.SUPPORTED_FEDORA_VERSIONS, frozenset)
         assert len(AzurePublishedConsumer.SUPPORTED_FEDORA_VERSIONS) > 0
 
-        # Test that all versions follow expected naming pattern
-        for version in AzurePublishedConsumer.SUPPORTED_FEDORA_VERSIONS:
-            assert isinstance(version, str)
-            assert version.startswith("Fedora-Cloud-")
-            assert version.endswith(("-x64", "-Arm64"))
+    @pytest.mark.parametrize("version", sorted(AzurePublishedConsumer.SUPPORTED_FEDORA_VERSIONS))
+    def test_supported_fedora_version_naming(self, version):
+        """Test that each supported version follows the image definition naming pattern."""
+        assert isinstance(version, str)
+        assert version.startswith("Fedora-Cloud-")
+        assert version.endswith(("-x64", "-Arm64"))
 
     def test_get_image_definition_name_success(self, consumer, valid_message):
         """Test successful extraction of image definition name."""
@@ -69,60 +83,158 @@ class TestAzurePublishedConsumer:
     def test_get_image_definition_name_invalid_data(self, consumer):
         """Test handling of invalid image definition name data."""
         # Test missing field
-        message = Mock()
-        message.body = {}
-        assert consumer._get_image_definition_name(message) is None
+        assert consumer._get_image_definition_name(SimpleNamespace(body={})) is None
 
         # Test non-string value
-        message.body = {"image_definition_name": 123}
+        message = SimpleNamespace(body={"image_definition_name": 123})
         assert consumer._get_image_definition_name(message) is None
 
         # Test missing body attribute
-        del message.body
-        assert consumer._get_image_definition_name(message) is None
+        assert consumer._get_image_definition_name(SimpleNamespace()) is None
+
+    def test_extract_test_details(self, consumer):
+        """Test that test cases are categorised by their JUnit status."""
+        root = ET.fromstring(
+            '<testsuites>'
+            '<testsuite name="Suite">'
+            '<testcase name="passes" time="1.500"/>'
+            '<testcase name="fails"><failure message="a &amp;lt;b&amp;gt;">trace</failure></testcase>'
+            '<testcase name="errors"><error message="boom"/></testcase>'
+            '<testcase name="skips"><skipped message="no quota"/></testcase>'
+            '</testsuite>'
+            '</testsuites>'
+        )
+
+        details = consumer._extract_test_details(root)
+
+        assert details == {
+            'passed': [("Suite.passes", "Test passed in 1.500 seconds.")],
+            'failed': [
+                ("Suite.fails", "Summary: a <b>\n Traceback: \ntrace"),
+                ("Suite.errors", "boom"),
+            ],
+            'skipped': [("Suite.skips", "no quota")],
+        }
 
-    @patch('fedora_cloud_tests.azure.subprocess.run')
-    @patch('os.chmod')
-    def test_generate_ssh_key_pair_success(self, mock_chmod, mock_subprocess, consumer):
+    def test_build_result_message_body(self, consumer, valid_message):
+        """Test that image metadata is copied into the result message body."""
+        valid_message.body = {
+            **valid_message.body,
+            "architecture": "x86_64",
+            "compose_id": "Fedora-Rawhide-20250101.n.0",
+        }
+        passed = {"count": 1, "tests": {"Suite.passes": "Test passed in 1.500 seconds."}}
+
+        body = consumer._build_result_message_body(valid_message, {"passed_tests": passed})
+
+        assert body == {
+            "architecture": "x86_64",
+            "compose_id": "Fedora-Rawhide-20250101.n.0",
+            "image_id": "Fedora-Cloud-Rawhide-x64",
+            "image_resource_id": valid_message.body["image_resource_id"],
+            "failed_tests": {"count": 0, "tests": {}},
+            "skipped_tests": {"count": 0, "tests": {}},
+            "passed_tests": passed,
+        }
+
+    def test_generate_ssh_key_pair_success(self, consumer, monkeypatch, tmp_path):
         """Test successful SSH key pair generation."""
         # Mock subprocess.run to simulate successful ssh-keygen
-        mock_subprocess.return_value = MagicMock(stdout="Key generated successfully")
-
-        with TemporaryDirectory() as temp_dir:
-            with patch('os.path.exists', return_value=True):
-                result = consumer._generate_ssh_key_pair(temp_dir)
-
-                # Verify the method returns the expected private key path
-                expected_path = os.path.join(temp_dir, "id_ed25519")
-                assert result == expected_path
-
-                # Verify ssh-keygen was called with correct parameters
-                mock_subprocess.assert_called_once()
-                call_args = mock_subprocess.call_args[0][0]
-                assert "ssh-keygen" in call_args
-                assert "-t" in call_args and "ed25519" in call_args
-                assert "-f" in call_args
-
-                # Verify file permissions were set
-                mock_chmod.assert_called_once_with(expected_path, 0o600)
-
-    @patch('fedora_cloud_tests.azure.subprocess.run')
-    def test_generate_ssh_key_pair_failures(self, mock_subprocess, consumer):
-        """Test SSH key pair generation failure cases."""
-        with TemporaryDirectory() as temp_dir:
-            # Test subprocess failure
-            mock_subprocess.side_effect = subprocess.CalledProcessError(1, 'ssh-keygen')
-            result = consumer._generate_ssh_key_pair(temp_dir)
-            assert result is None
-
-            # Reset mock for next test
-            mock_subprocess.side_effect = None
-            mock_subprocess.return_value = MagicMock(stdout="Key generated")
-
-            # Test file not created scenario
-            with patch('os.path.exists', return_value=False):
-                result = consumer._generate_ssh_key_pair(temp_dir)
-                assert result is None
+        mock_subprocess = MagicMock(return_value=MagicMock(stdout="Key generated successfully"))
+        mock_chmod = MagicMock()
+        monkeypatch.setattr('fedora_cloud_tests.azure.subprocess.run', mock_subprocess)
+        monkeypatch.setattr('os.chmod', mock_chmod)
+        monkeypatch.setattr('os.path.exists', lambda path: True)
+
+        result = consumer._generate_ssh_key_pair(str(tmp_path))
+
+        # Verify the method returns the expected private key path
+        expected_path = os.path.join(tmp_path, "id_ed25519")
+        assert result == expected_path
+
+        # Verify ssh-keygen was called with correct parameters
+        mock_subprocess.assert_called_once()
+        call_args = mock_subprocess.call_args[0][0]
+        assert "ssh-keygen" in call_args
+        assert "-t" in call_args and "ed25519" in call_args
+        assert "-f" in call_args
+
+        # Verify file permissions were set
+        mock_chmod.assert_called_once_with(expected_path, 0o600)
+
+    @pytest.mark.parametrize(
+        "error",
+        [subprocess.CalledProcessError(1, 'ssh-keygen'), subprocess.TimeoutExpired('ssh-keygen', 60)],
+        ids=["non-zero-exit", "timeout"],
+    )
+    def test_generate_ssh_key_pair_command_failure(self, consumer, monkeypatch, tmp_path, error):
+        """Test SSH key pair generation when ssh-keygen fails."""
+        def failing_run(*args, **kwargs):
+            raise error
+
+        monkeypatch.setattr('fedora_cloud_tests.azure.subprocess.run', failing_run)
+
+        assert consumer._generate_ssh_key_pair(str(tmp_path)) is None
+
+    def test_generate_ssh_key_pair_missing_key_file(self, consumer, monkeypatch, tmp_path):
+        """Test SSH key pair generation when the private key file is not created."""
+        monkeypatch.setattr(
+            'fedora_cloud_tests.azure.subprocess.run',
+            lambda *args, **kwargs: MagicMock(stdout="Key generated"),
+        )
+        monkeypatch.setattr('os.path.exists', lambda path: False)
+
+        assert consumer._generate_ssh_key_pair(str(tmp_path)) is None
+
+    def test_get_private_key_generated_once(self, consumer):
+        """Test that the SSH key pair is generated once and then reused."""
+        with patch.object(consumer, '_generate_ssh_key_pair', side_effect=fake_ssh_keygen) as mock_keygen:
+            private_key = consumer._get_private_key()
+            assert consumer._get_private_key() == private_key
+
+            mock_keygen.assert_called_once_with(consumer._ssh_key_dir.name)
+
+    def test_get_private_key_retries_after_failure(self, consumer):
+        """Test that a failed key generation is retried in a fresh directory."""
+        attempts = []
+
+        def keygen(temp_dir):
+            attempts.append(temp_dir)
+            if len(attempts) == 1:
+                # A failed attempt that leaves a key behind, which ssh-keygen won't overwrite
+                fake_ssh_keygen(temp_dir)
+                return None
+            return fake_ssh_keygen(temp_dir)
+
+        with patch.object(consumer, '_generate_ssh_key_pair', side_effect=keygen):
+            assert consumer._get_private_key() is None
+            assert not os.path.exists(attempts[0])
+            assert consumer._get_private_key() == os.path.join(attempts[1], "id_ed25519")
+
+        assert attempts[0] != attempts[1]
+
+    def test_get_private_key_regenerated_when_removed(self, consumer):
+        """Test that a key removed from disk is replaced in a new directory."""
+        with patch.object(consumer, '_generate_ssh_key_pair', side_effect=fake_ssh_keygen) as mock_keygen:
+            private_key = consumer._get_private_key()
+            old_key_dir = os.path.dirname(private_key)
+            shutil.rmtree(old_key_dir)
+
+            new_private_key = consumer._get_private_key()
+
+            assert mock_keygen.call_count == 2
+            assert os.path.exists(new_private_key)
+            assert os.path.dirname(new_private_key) != old_key_dir
+
+    def test_close_removes_ssh_key_dir(self, consumer):
+        """Test that close() removes the generated key pair."""
+        with patch.object(consumer, '_generate_ssh_key_pair', side_effect=fake_ssh_keygen):
+            key_dir = os.path.dirname(consumer._get_private_key())
+
+        consumer.close()
+
+        assert not os.path.exists(key_dir)
+        assert consumer._private_key is None
 
     def test_get_community_gallery_image_success(self, consumer, valid_message):
         """Test successful community gallery image construction."""
@@ -130,94 +242,135 @@ class TestAzurePublishedConsumer:
         expected = "westus3/test-sub/Fedora-Cloud-Rawhide-x64/20250101.0"
         assert result == expected
 
-    def test_get_community_gallery_image_invalid_cases(self, consumer):
+    @pytest.mark.parametrize(
+        "body",
+        [
+            pytest.param(
+                {
+                    "image_definition_name": "Fedora-Cloud-Unsupported-x64",
+                    "image_version_name": "20250101.0",
+                    "image_resource_id": "/subscriptions/test-sub/resourceGroups/test-rg/providers/Microsoft.Compute/galleries/test-gallery"
+                },
+                id="unsupported-version",
+            ),
+            pytest.param("not_a_dict", id="body-not-a-dict"),
+            pytest.param({"image_definition_name": "Fedora-Cloud-Rawhide-x64"}, id="missing-fields"),
+            pytest.param(
+                {
+                    "image_definition_name": "Fedora-Cloud-Rawhide-x64",
+                    "image_version_name": "20250101.0",
+                    "image_resource_id": "invalid/format"
+                },
+                id="invalid-resource-id",
+            ),
+        ],
+    )
+    def test_get_community_gallery_image_invalid_cases(self, consumer, body):
         """Test community gallery image extraction with invalid inputs."""
-        # Test unsupported Fedora version
-        message = Mock()
-        message.body = {
-            "image_definition_name": "Fedora-Cloud-Unsupported-x64",
-            "image_version_name": "20250101.0",
-            "image_resource_id": "/subscriptions/test-sub/resourceGroups/test-rg/providers/Microsoft.Compute/galleries/test-gallery"
-        }
-        assert consumer.get_community_gallery_image(message) is None
-
-        # Test invalid message body type
-        message.body = "not_a_dict"
-        assert consumer.get_community_gallery_image(message) is None
-
-        # Test missing required fields
-        message.body = {"image_definition_name": "Fedora-Cloud-Rawhide-x64"}
-        assert consumer.get_community_gallery_image(message) is None
+        assert consumer.get_community_gallery_image(SimpleNamespace(body=body)) is None
 
-        # Test invalid resource ID format
-        message.body = {
-            "image_definition_name": "Fedora-Cloud-Rawhide-x64",
-            "image_version_name": "20250101.0",
-            "image_resource_id": "invalid/format"
-        }
-        assert consumer.get_community_gallery_image(message) is None
-
-        # Test resource_id with insufficient parts (code allows empty parts[2])
-        message.body = {
+    def test_get_community_gallery_image_empty_resource_id_parts(self, consumer):
+        """Test that a resource ID with an empty subscription part is still accepted."""
+        message = SimpleNamespace(body={
             "image_definition_name": "Fedora-Cloud-Rawhide-x64",
             "image_version_name": "20250101.0",
             "image_resource_id": "//"  # Results in empty parts[2] but still valid per current logic
-        }
+        })
         result = consumer.get_community_gallery_image(message)
         # The current code allows this and creates: "westus3//Fedora-Cloud-Rawhide-x64/20250101.0"
         assert result == "westus3//Fedora-Cloud-Rawhide-x64/20250101.0"
 
-    @patch('fedora_cloud_tests.azure.asyncio.run')
-    @patch('fedora_cloud_tests.azure.LisaRunner')
-    @patch.object(AzurePublishedConsumer, '_generate_ssh_key_pair')
-    def test_azure_published_callback_success(self, mock_ssh_keygen, mock_lisa_runner, mock_asyncio_run, consumer, valid_message):  # pylint: disable=R0913,R0917
-        """Test successful message processing and LISA trigger."""
-        mock_runner_instance = MagicMock()
-        mock_lisa_runner.return_value = mock_runner_instance
-        mock_ssh_keygen.return_value = "/tmp/test_key"
+    def test_call_method_delegates_to_callback(self, consumer, valid_message):
+        """Test that __call__ method properly delegates to azure_published_callback."""
+        with patch.object(consumer, 'azure_published_callback') as mock_callback:
+            consumer(valid_message)
+            mock_callback.assert_called_once_with(valid_message)
 
+
+class TestAzurePublishedCallback:
+    """Test class for AzurePublishedConsumer.azure_published_callback."""
+
+    @pytest.fixture(autouse=True)
+    def _patches(self, monkeypatch):
+        """Replace the LISA runner, the event loop and SSH key generation with mocks."""
+        self.lisa_runner = MagicMock()  # pylint: disable=attribute-defined-outside-init
+        self.asyncio_run = MagicMock()  # pylint: disable=attribute-defined-outside-init
+        monkeypatch.setattr('fedora_cloud_tests.azure.LisaRunner', self.lisa_runner)
+        monkeypatch.setattr('fedora_cloud_tests.azure.asyncio.run', self.asyncio_run)
+        monkeypatch.setattr(
+            AzurePublishedConsumer, '_generate_ssh_key_pair', MagicMock(return_value="/tmp/test_key")
+        )
+
+    def test_azure_published_callback_success(self, consumer, valid_message):
+        """Test successful message processing and LISA trigger."""
         consumer.azure_published_callback(valid_message)
-        mock_lisa_runner.assert_called_once_with()
-        mock_asyncio_run.assert_called_once()
-
-    @patch('fedora_cloud_tests.azure.asyncio.run')
-    @patch('fedora_cloud_tests.azure.LisaRunner')
-    def test_azure_published_callback_unsupported_image(self, mock_lisa_runner, mock_asyncio_run, consumer):
-        """Test handling when community gallery image cannot be processed."""
-        message = Mock()
-        message.topic = "test.topic"
-        message.body = {"image_definition_name": "Fedora-Cloud-Unsupported-x64"}
-
-        consumer.azure_published_callback(message)
-        mock_lisa_runner.assert_not_called()
-        mock_asyncio_run.assert_not_called()
-
-    @patch('fedora_cloud_tests.azure.asyncio.run', side_effect=OSError("LISA execution failed"))
-    @patch('fedora_cloud_tests.azure.LisaRunner')
-    @patch.object(AzurePublishedConsumer, '_generate_ssh_key_pair')
-    def test_azure_published_callback_lisa_exception(self, mock_ssh_keygen, mock_lisa_runner, mock_asyncio_run, consumer, valid_message):  # pylint: disable=R0913,R0917
+        self.lisa_runner.assert_called_once_with()
+        self.asyncio_run.assert_called_once()
+
+    @pytest.mark.parametrize(
+        "lisa_result,published",
+        [(LisaResult.OK, True), (LisaResult.NONZERO_EXIT, False), (LisaResult.TIMEOUT, False)],
+    )
+    def test_azure_published_callback_publishes_on_success(
+        self, consumer, valid_message, lisa_result, published
+    ):
+        """Test that results are only parsed and published when LISA reports success."""
+        self.asyncio_run.return_value = lisa_result
+        with patch.object(consumer, '_parse_test_results', return_value={"total_tests": 1}), \
+                patch.object(consumer, 'publish_test_results') as mock_publish:
+            consumer.azure_published_callback(valid_message)
+
+        assert mock_publish.called is published
+
+    @pytest.mark.parametrize(
+        "error",
+        [OSError("LISA execution failed"), ValueError("Separator is not found, and chunk exceed the limit")],
+        ids=["os-error", "unexpected-error"],
+    )
+    def test_azure_published_callback_lisa_exception(self, consumer, valid_message, error):
         """Test exception handling when LISA execution fails."""
-        mock_runner_instance = MagicMock()
-        mock_lisa_runner.return_value = mock_runner_instance
-        mock_ssh_keygen.return_value = "/tmp/test_key"
+        self.asyncio_run.side_effect = error
 
         # Should not raise exception, just log it
         consumer.azure_published_callback(valid_message)
-        mock_asyncio_run.assert_called_once()
-
-    def test_azure_published_callback_message_validation_exception(self, consumer):
-        """Test exception handling during message type validation."""
-        # Create a message that will cause a TypeError during isinstance check
-        # by making it not a proper message type
-        invalid_message = Mock()
-        invalid_message.topic = "test.topic"
-        invalid_message.body = "not_a_dict"  # This will cause isinstance issues
-
+        self.asyncio_run.assert_called_once()
+
+    @pytest.mark.parametrize(
+        "topic,body",
+        [
+            pytest.param(
+                "org.fedoraproject.prod.fedora_image_uploader.published.v1.azure.test",
+                {"image_definition_name": "Fedora-Cloud-Unsupported-x64"},
+                id="unsupported-image",
+            ),
+            pytest.param(
+                "org.fedoraproject.prod.fedora_image_uploader.published.v1.aws.test",
+                {
+                    "image_definition_name": "Fedora-Cloud-Rawhide-x64",
+                    "image_version_name": "20250101.0",
+                    "image_resource_id": "/subscriptions/test-sub/resourceGroups/test-rg/providers/Microsoft.Compute/galleries/test-gallery"
+                },
+                id="unexpected-topic",
+            ),
+            pytest.param(
+                "org.fedoraproject.prod.fedora_image_uploader.published.v1.azure_foo",
+                {
+                    "image_definition_name": "Fedora-Cloud-Rawhide-x64",
+                    "image_version_name": "20250101.0",
+                    "image_resource_id": "/subscriptions/test-sub/resourceGroups/test-rg/providers/Microsoft.Compute/galleries/test-gallery"
+                },
+                id="topic-with-azure-prefix-only",
+            ),
+            pytest.param(
+                "org.fedoraproject.prod.fedora_image_uploader.published.v1.azure.test",
+                "not_a_dict",
+                id="body-not-a-dict",
+            ),
+        ],
+    )
+    def test_azure_published_callback_skips_message(self, consumer, topic, body):
+        """Test that messages which cannot be tested are dropped without running LISA."""
         # This should not crash but should log errors and return early
-        consumer.azure_published_callback(invalid_message)
-
-    def test_call_method_delegates_to_callback(self, consumer, valid_message):
-        """Test that __call__ method properly delegates to azure_published_callback."""
-        with patch.object(consumer, 'azure_published_callback') as mock_callback:
-            consumer(valid_message)
-            mock_callback.assert_called_once_with(valid_message)
+        consumer.azure_published_callback(SimpleNamespace(topic=topic, body=body))
+        self.lisa_runner.assert_not_called()
+        self.asyncio_run.assert_not_called()
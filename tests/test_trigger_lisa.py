@@ -1,11 +1,37 @@
 """Unit tests for the LisaRunner class in trigger_lisa.py."""
 
+import asyncio
 import subprocess
-from unittest.mock import patch, MagicMock, AsyncMock
+from types import SimpleNamespace
+from unittest.mock import patch, AsyncMock, MagicMock, Mock
 import pytest
 from fedora_cloud_tests import trigger_lisa
 
 # pylint: disable=protected-access
+def make_process(returncode=0, stdout_lines=(b"LISA test output line 1\n", b"LISA test output line 2\n")):
+    """Create a stand-in for an asyncio subprocess that has already written stdout_lines."""
+    # Like StreamReader.readuntil, signal the end of the output with IncompleteReadError
+    stdout = SimpleNamespace(
+        readuntil=AsyncMock(side_effect=[*stdout_lines, asyncio.IncompleteReadError(b"", None)])
+    )
+    return SimpleNamespace(
+        pid=12345,
+        returncode=returncode,
+        stdout=stdout,
+        wait=AsyncMock(),
+        terminate=Mock(),
+        kill=Mock(),
+    )
+
+
+def make_hanging_stdout():
+    """Create a stand-in for the output of a LISA run that never writes anything."""
+    async def readuntil(_separator):
+        await asyncio.sleep(60)
+
+    return SimpleNamespace(readuntil=readuntil)
+
+
 @pytest.fixture
 def runner():
     """Create a LisaRunner instance for testing."""
@@ -26,23 +52,23 @@ def test_setup(runner, region, community_gallery_image, config_params):
 @pytest.fixture
 def mock_process():
     """Create a properly mocked async subprocess for testing."""
-    process = MagicMock()
-    process.returncode = 0
-    process.wait = AsyncMock()
+    return make_process()
 
-    # Mock stdout as an async iterator
-    async def mock_stdout_lines():
-        lines = [b"LISA test output line 1\n", b"LISA test output line 2\n"]
-        for line in lines:
-            yield line
 
-    process.stdout = mock_stdout_lines()
-    return process
+@pytest.fixture
+def mock_subproc_exec(monkeypatch, mock_process):
+    """Replace asyncio.create_subprocess_exec with a mock that returns mock_process."""
+    mock_exec = AsyncMock(return_value=mock_process)
+    monkeypatch.setattr("asyncio.create_subprocess_exec", mock_exec)
+    return mock_exec
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def config_params():
-    """Create test configuration parameters."""
+    """Create test configuration parameters.
+
+    Shared across the session, so tests must copy it before making changes.
+    """
     return {
         "subscription": "test-subscription-id",
         "private_key": "/path/to/private/key",
@@ -51,13 +77,13 @@ def config_params():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def region():
     """Create test region."""
     return "westus2"
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def community_gallery_image():
     """Create test community gallery image."""
     return "test/gallery/image"
@@ -67,75 +93,79 @@ class TestLisaRunner:
     """Test class for LisaRunner."""
 
     @pytest.mark.asyncio
-    async def test_trigger_lisa_success(self, test_setup, mock_process):
+    async def test_trigger_lisa_success(self, test_setup, mock_process, mock_subproc_exec):
         """Test successful execution of the trigger_lisa method."""
-        with patch("asyncio.create_subprocess_exec") as mock_subproc_exec:
-            mock_subproc_exec.return_value = mock_process
+        result = await test_setup['runner'].trigger_lisa(
+            test_setup['region'], test_setup['community_gallery_image'], test_setup['config_params']
+        )
 
+        assert result == trigger_lisa.LisaResult.OK
+        mock_subproc_exec.assert_called_once()
+        mock_process.wait.assert_called_once()
+
+    @pytest.mark.asyncio
+    @pytest.mark.usefixtures("mock_subproc_exec")
+    async def test_trigger_lisa_success_with_warnings(self, test_setup):
+        """Test successful execution with output."""
+        with patch.object(trigger_lisa._log, "isEnabledFor", return_value=True), \
+                patch.object(trigger_lisa._log, "info") as mock_logger_info:
             result = await test_setup['runner'].trigger_lisa(
                 test_setup['region'], test_setup['community_gallery_image'], test_setup['config_params']
             )
 
-            assert result is True
-            mock_subproc_exec.assert_called_once()
-            mock_process.wait.assert_called_once()
+            assert result == trigger_lisa.LisaResult.OK
+            # Check that LISA output was logged
+            mock_logger_info.assert_any_call("LISA OUTPUT: %s ", "LISA test output line 1")
 
     @pytest.mark.asyncio
-    async def test_trigger_lisa_success_with_warnings(self, test_setup, mock_process):
-        """Test successful execution with output."""
-        with patch("asyncio.create_subprocess_exec") as mock_subproc_exec:
-            mock_subproc_exec.return_value = mock_process
-
-            with patch.object(trigger_lisa._log, "info") as mock_logger_info:
-                result = await test_setup['runner'].trigger_lisa(
-                    test_setup['region'], test_setup['community_gallery_image'], test_setup['config_params']
-                )
+    async def test_trigger_lisa_logs_quoted_command(self, runner, region, community_gallery_image, config_params, mock_subproc_exec):
+        """Test that the logged command quotes arguments containing spaces."""
+        config_with_spaces = {**config_params, "run_name": "nightly run"}
+        with patch.object(trigger_lisa._log, "isEnabledFor", return_value=True), \
+                patch.object(trigger_lisa._log, "info") as mock_logger_info:
+            await runner.trigger_lisa(region, community_gallery_image, config_with_spaces)
 
-                assert result is True
-                # Check that LISA output was logged
-                mock_logger_info.assert_any_call("LISA OUTPUT: %s ", "LISA test output line 1")
+        logged_command = mock_logger_info.call_args_list[0].args[1]
+        assert logged_command.endswith("-i 'nightly run'")
+        assert mock_subproc_exec.call_args.args[-1] == "nightly run"
 
     @pytest.mark.asyncio
     async def test_trigger_lisa_failure_non_zero_return_code(self, runner, region, community_gallery_image, config_params):
         """Test failure when LISA returns non-zero exit code."""
-        with patch("asyncio.create_subprocess_exec") as mock_subproc_exec:
-            mock_process = MagicMock()
-            mock_process.returncode = 1
-            mock_process.wait = AsyncMock()
-
-            # Mock stdout as an async iterator with error output
-            async def mock_stdout_lines():
-                lines = [b"Error: LISA test failed\n", b"Additional error details\n"]
-                for line in lines:
-                    yield line
-
-            mock_process.stdout = mock_stdout_lines()
-            mock_subproc_exec.return_value = mock_process
-
+        failed_process = make_process(
+            returncode=1, stdout_lines=(b"Error: LISA test failed\n", b"Additional error details\n")
+        )
+        with patch("asyncio.create_subprocess_exec", return_value=failed_process):
             with patch.object(trigger_lisa._log, "error") as mock_logger_error:
                 result = await runner.trigger_lisa(
                     region, community_gallery_image, config_params
                 )
 
-                assert result is False
+                assert result == trigger_lisa.LisaResult.NONZERO_EXIT
                 mock_logger_error.assert_any_call("LISA test failed with return code: %d", 1)
 
     @pytest.mark.asyncio
     async def test_trigger_lisa_exception_handling(self, runner, region, community_gallery_image, config_params):
-        """Test error handling and logging when subprocess execution fails."""
-        with patch(
-            "asyncio.create_subprocess_exec", side_effect=Exception("Process failed")
-        ):
+        """Test error handling and logging when the LISA process cannot be started."""
+        error = FileNotFoundError("No such file or directory: 'lisa'")
+        with patch("asyncio.create_subprocess_exec", side_effect=error):
             with patch.object(trigger_lisa._log, "error") as mock_logger_error:
                 result = await runner.trigger_lisa(
                     region, community_gallery_image, config_params
                 )
 
-                assert result is False
+                assert result == trigger_lisa.LisaResult.SUBPROCESS_ERROR
                 mock_logger_error.assert_called_with(
-                    "An error occurred while running the tests: %s", "Process failed"
+                    "An error occurred while running the tests: %s", error
                 )
 
+    @pytest.mark.asyncio
+    async def test_trigger_lisa_unexpected_exception_propagates(self, runner, region, community_gallery_image, config_params):
+        """Test that errors other than OSError are not reported as a failed LISA run."""
+        with patch("asyncio.create_subprocess_exec", side_effect=ValueError("unexpected")):
+            with pytest.raises(ValueError, match="unexpected"):
+                await runner.trigger_lisa(region, community_gallery_image, config_params)
+
     @pytest.mark.asyncio
     async def test_trigger_lisa_missing_region(self, runner, community_gallery_image, config_params):
         """Test validation failure when region is missing."""
@@ -144,7 +174,7 @@ class TestLisaRunner:
                 "", community_gallery_image, config_params
             )
 
-            assert result is False
+            assert result == trigger_lisa.LisaResult.VALIDATION
             mock_logger_error.assert_called_with(
                 "Invalid region parameter: must be a non-empty string"
             )
@@ -155,7 +185,7 @@ class TestLisaRunner:
         with patch.object(trigger_lisa._log, "error") as mock_logger_error:
             result = await runner.trigger_lisa(region, "", config_params)
 
-            assert result is False
+            assert result == trigger_lisa.LisaResult.VALIDATION
             mock_logger_error.assert_called_with(
                 "Invalid community_gallery_image parameter: must be a non-empty string"
             )
@@ -171,7 +201,7 @@ class TestLisaRunner:
                 region, community_gallery_image, config_without_subscription
             )
 
-            assert result is False
+            assert result == trigger_lisa.LisaResult.VALIDATION
             mock_logger_error.assert_called_with(
                 "Missing required parameter: subscription"
             )
@@ -187,52 +217,61 @@ class TestLisaRunner:
                 region, community_gallery_image, config_without_private_key
             )
 
-            assert result is False
+            assert result == trigger_lisa.LisaResult.VALIDATION
             mock_logger_error.assert_called_with(
                 "Missing required parameter: private_key"
             )
 
     @pytest.mark.asyncio
-    async def test_trigger_lisa_command_construction(self, test_setup, mock_process):
+    async def test_trigger_lisa_command_construction(self, test_setup, mock_subproc_exec):
         """Test that the LISA command is constructed correctly."""
-        with patch("asyncio.create_subprocess_exec") as mock_subproc_exec:
-            mock_subproc_exec.return_value = mock_process
-
-            await test_setup['runner'].trigger_lisa(
-                test_setup['region'], test_setup['community_gallery_image'], test_setup['config_params']
-            )
-
-            # Verify the command was called with correct arguments
-            expected_command = [
-                "lisa",
-                "-r",
-                "microsoft/runbook/azure_fedora.yml",
-                "-v",
-                "tier:1",
-                "-v",
-                "test_case_name:verify_dhcp_file_configuration",
-                "-v",
-                f"region:{test_setup['region']}",
-                "-v",
-                f"community_gallery_image:{test_setup['community_gallery_image']}",
-                "-v",
-                f"subscription_id:{test_setup['config_params']['subscription']}",
-                "-v",
-                f"admin_private_key_file:{test_setup['config_params']['private_key']}",
-                "-l",
-                test_setup['config_params']["log_path"],
-                "-i",
-                test_setup['config_params']["run_name"],
-            ]
-
-            mock_subproc_exec.assert_called_once_with(
-                *expected_command,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-            )
+        await test_setup['runner'].trigger_lisa(
+            test_setup['region'], test_setup['community_gallery_image'], test_setup['config_params']
+        )
+
+        # Verify the command was called with correct arguments
+        expected_command = [
+            "lisa",
+            "-r",
+            "microsoft/runbook/azure_fedora.yml",
+            "-v",
+            "tier:1",
+            "-v",
+            "test_case_name:verify_dhcp_file_configuration",
+            "-v",
+            f"region:{test_setup['region']}",
+            "-v",
+            f"community_gallery_image:{test_setup['community_gallery_image']}",
+            "-v",
+            f"subscription_id:{test_setup['config_params']['subscription']}",
+            "-v",
+            f"admin_private_key_file:{test_setup['config_params']['private_key']}",
+            "-l",
+            test_setup['config_params']["log_path"],
+            "-i",
+            test_setup['config_params']["run_name"],
+        ]
+
+        mock_subproc_exec.assert_called_once_with(
+            *expected_command,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            limit=trigger_lisa.OUTPUT_LINE_LIMIT,
+        )
+
+    def test_build_command_without_optional_parameters(self, runner, region, community_gallery_image):
+        """Test that _build_command needs no subprocess and omits unset optional flags."""
+        command = runner._build_command(region, community_gallery_image, "sub", "/key")
+
+        assert command[-8:] == [
+            "-v", f"region:{region}",
+            "-v", f"community_gallery_image:{community_gallery_image}",
+            "-v", "subscription_id:sub",
+            "-v", "admin_private_key_file:/key",
+        ]
 
     @pytest.mark.asyncio
-    async def test_trigger_lisa_missing_optional_config_parameters(self, runner, region, community_gallery_image, mock_process):
+    async def test_trigger_lisa_missing_optional_config_parameters(self, runner, region, community_gallery_image, mock_subproc_exec):
         """Test successful execution when optional config parameters 
         (log_path, run_name) are missing."""
         minimal_config = {
@@ -241,28 +280,25 @@ class TestLisaRunner:
             # log_path and run_name are missing
         }
 
-        with patch("asyncio.create_subprocess_exec") as mock_subproc_exec:
-            mock_subproc_exec.return_value = mock_process
+        result = await runner.trigger_lisa(
+            region, community_gallery_image, minimal_config
+        )
 
-            result = await runner.trigger_lisa(
-                region, community_gallery_image, minimal_config
-            )
-
-            # Now the implementation should handle missing optional parameters gracefully
-            assert result is True
+        # Now the implementation should handle missing optional parameters gracefully
+        assert result == trigger_lisa.LisaResult.OK
 
-            # Verify command is called but without the optional -l and -i flags
-            args, _ = mock_subproc_exec.call_args
-            command_list = list(args)
-            assert "-l" not in command_list
-            assert "-i" not in command_list
-            # But should still have the required arguments
-            assert "lisa" in command_list
-            assert "-r" in command_list
-            assert "microsoft/runbook/azure_fedora.yml" in command_list
+        # Verify command is called but without the optional -l and -i flags
+        args, _ = mock_subproc_exec.call_args
+        command_list = list(args)
+        assert "-l" not in command_list
+        assert "-i" not in command_list
+        # But should still have the required arguments
+        assert "lisa" in command_list
+        assert "-r" in command_list
+        assert "microsoft/runbook/azure_fedora.yml" in command_list
 
     @pytest.mark.asyncio
-    async def test_trigger_lisa_with_optional_config_parameters(self, runner, region, community_gallery_image, mock_process):
+    async def test_trigger_lisa_with_optional_config_parameters(self, runner, region, community_gallery_image, mock_subproc_exec):
         """Test successful execution when optional config parameters are provided."""
         config_with_optionals = {
             "subscription": "test-subscription",
@@ -271,21 +307,18 @@ class TestLisaRunner:
             "run_name": "custom-run-name",
         }
 
-        with patch("asyncio.create_subprocess_exec") as mock_subproc_exec:
-            mock_subproc_exec.return_value = mock_process
-
-            result = await runner.trigger_lisa(
-                region, community_gallery_image, config_with_optionals
-            )
+        result = await runner.trigger_lisa(
+            region, community_gallery_image, config_with_optionals
+        )
 
-            assert result is True
-            # Verify command includes the provided optional parameters
-            args, _ = mock_subproc_exec.call_args
-            command_list = list(args)
-            assert "-l" in command_list
-            assert "/custom/log/path" in command_list
-            assert "-i" in command_list
-            assert "custom-run-name" in command_list
+        assert result == trigger_lisa.LisaResult.OK
+        # Verify command includes the provided optional parameters
+        args, _ = mock_subproc_exec.call_args
+        command_list = list(args)
+        assert "-l" in command_list
+        assert "/custom/log/path" in command_list
+        assert "-i" in command_list
+        assert "custom-run-name" in command_list
 
     @pytest.mark.asyncio
     async def test_trigger_lisa_invalid_config_type(self, runner, region, community_gallery_image):
@@ -295,7 +328,266 @@ class TestLisaRunner:
                 region, community_gallery_image, "not a dict"  # Invalid type
             )
 
-            assert result is False
+            assert result == trigger_lisa.LisaResult.VALIDATION
             mock_logger_error.assert_called_with(
                 "Invalid config parameter: must be a dictionary"
             )
+
+    @pytest.mark.asyncio
+    async def test_run_many(self, region, community_gallery_image, config_params):
+        """Test that run_many triggers every job and returns results in job order."""
+        jobs = [
+            (region, community_gallery_image, config_params),
+            ("eastus", community_gallery_image, config_params),
+        ]
+        with patch(
+            "asyncio.create_subprocess_exec", side_effect=[make_process(), make_process(returncode=1)]
+        ) as mock_subproc_exec:
+            results = await trigger_lisa.LisaRunner.run_many(jobs)
+
+        assert results == [trigger_lisa.LisaResult.OK, trigger_lisa.LisaResult.NONZERO_EXIT]
+        assert mock_subproc_exec.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_run_many_limits_concurrency(self, region, community_gallery_image, config_params):
+        """Test that run_many never runs more than `concurrency` LISA processes at once."""
+        running = 0
+        peak = 0
+
+        async def start_process(*_args, **_kwargs):
+            process = make_process()
+
+            async def wait():
+                nonlocal running, peak
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(0.01)
+                running -= 1
+
+            process.wait = wait
+            return process
+
+        jobs = [(region, community_gallery_image, config_params)] * 5
+        with patch("asyncio.create_subprocess_exec", side_effect=start_process):
+            results = await trigger_lisa.LisaRunner.run_many(jobs, concurrency=2)
+
+        assert results == [trigger_lisa.LisaResult.OK] * 5
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_run_many_returns_unexpected_exceptions(self, region, community_gallery_image, config_params):
+        """Test that an unexpected error in one job does not stop the others."""
+        error = ValueError("unexpected")
+        jobs = [
+            (region, community_gallery_image, config_params),
+            ("eastus", community_gallery_image, config_params),
+        ]
+        with patch("asyncio.create_subprocess_exec", side_effect=[error, make_process()]):
+            results = await trigger_lisa.LisaRunner.run_many(jobs)
+
+        assert results == [error, trigger_lisa.LisaResult.OK]
+
+
+class TestStreamOutput:
+    """Test class for reading the LISA output."""
+
+    @pytest.mark.asyncio
+    async def test_stream_output_skips_decoding_when_info_disabled(self, runner):
+        """Test that the output is drained but not decoded when INFO logging is disabled."""
+        line = MagicMock()
+        process = make_process(stdout_lines=(line,))
+        with patch.object(trigger_lisa._log, "isEnabledFor", return_value=False), \
+                patch.object(trigger_lisa._log, "info") as mock_logger_info:
+            await runner._stream_output(process)
+
+        line.decode.assert_not_called()
+        mock_logger_info.assert_not_called()
+        process.wait.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_stream_output_skips_over_long_lines(self, runner):
+        """Test that a line longer than the reader limit is skipped rather than ending the run."""
+        stdout = asyncio.StreamReader(limit=64)
+        stdout.feed_data(b"x" * 200 + b"\nafter the long line\n")
+        stdout.feed_eof()
+        process = make_process()
+        process.stdout = stdout
+        with patch.object(trigger_lisa._log, "isEnabledFor", return_value=True), \
+                patch.object(trigger_lisa._log, "info") as mock_logger_info, \
+                patch.object(trigger_lisa._log, "warning") as mock_logger_warning:
+            await runner._stream_output(process)
+
+        mock_logger_warning.assert_called_once()
+        mock_logger_info.assert_called_once_with("LISA OUTPUT: %s ", "after the long line")
+        process.wait.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_stream_output_skips_over_long_lines_written_in_chunks(self, runner):
+        """Test that all of an over-long line is skipped when it arrives over several reads."""
+        stdout = asyncio.StreamReader(limit=64)
+
+        async def write_output():
+            for chunk in (b"x" * 100, b"x" * 100, b"x" * 100 + b"\nafter the long line\n"):
+                await asyncio.sleep(0)
+                stdout.feed_data(chunk)
+            stdout.feed_eof()
+
+        process = make_process()
+        process.stdout = stdout
+        with patch.object(trigger_lisa._log, "isEnabledFor", return_value=True), \
+                patch.object(trigger_lisa._log, "info") as mock_logger_info, \
+                patch.object(trigger_lisa._log, "warning") as mock_logger_warning:
+            writer = asyncio.create_task(write_output())
+            await runner._stream_output(process)
+            await writer
+
+        mock_logger_warning.assert_called_once()
+        mock_logger_info.assert_called_once_with("LISA OUTPUT: %s ", "after the long line")
+
+
+class TestLisaRunnerTermination:
+    """Test class for stopping LISA runs that time out or are cancelled."""
+
+    @pytest.mark.asyncio
+    async def test_trigger_lisa_timeout(self, runner, region, community_gallery_image, config_params):
+        """Test that a LISA run exceeding the timeout is terminated."""
+        process = make_process(returncode=None)
+
+        process.stdout = make_hanging_stdout()
+        config_with_timeout = {**config_params, "timeout": 0.01}
+
+        with patch("asyncio.create_subprocess_exec", return_value=process):
+            with patch.object(trigger_lisa._log, "error") as mock_logger_error:
+                result = await runner.trigger_lisa(
+                    region, community_gallery_image, config_with_timeout
+                )
+
+                assert result == trigger_lisa.LisaResult.TIMEOUT
+                mock_logger_error.assert_called_with(
+                    "LISA test did not finish within %s seconds, terminating it", 0.01
+                )
+        process.terminate.assert_called_once()
+        process.kill.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_trigger_lisa_timeout_kills_unresponsive_process(
+        self, runner, region, community_gallery_image, config_params
+    ):
+        """Test that LISA is killed if it ignores the terminate request."""
+        process = make_process(returncode=None)
+
+        async def hanging_wait():
+            if not process.kill.called:
+                await asyncio.sleep(60)
+
+        process.wait = hanging_wait
+        process.stdout = make_hanging_stdout()
+        config_with_timeout = {**config_params, "timeout": 0.01}
+
+        with patch("asyncio.create_subprocess_exec", return_value=process), \
+                patch.object(trigger_lisa, "TERMINATE_GRACE_PERIOD", 0.01):
+            result = await runner.trigger_lisa(region, community_gallery_image, config_with_timeout)
+
+        assert result == trigger_lisa.LisaResult.TIMEOUT
+        process.terminate.assert_called_once()
+        process.kill.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_trigger_lisa_cancelled_terminates_process(
+        self, runner, region, community_gallery_image, config_params
+    ):
+        """Test that cancelling a run terminates LISA before the cancellation propagates."""
+        process = make_process(returncode=None)
+
+        process.stdout = make_hanging_stdout()
+
+        with patch("asyncio.create_subprocess_exec", return_value=process):
+            task = asyncio.create_task(runner.trigger_lisa(region, community_gallery_image, config_params))
+            await asyncio.sleep(0.01)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        process.terminate.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_trigger_lisa_output_error_terminates_process(
+        self, runner, region, community_gallery_image, config_params
+    ):
+        """Test that LISA is terminated when reading its output fails unexpectedly."""
+        process = make_process(returncode=None)
+
+        process.stdout.readuntil.side_effect = RuntimeError("pipe broke")
+
+        with patch("asyncio.create_subprocess_exec", return_value=process):
+            with pytest.raises(RuntimeError, match="pipe broke"):
+                await runner.trigger_lisa(region, community_gallery_image, config_params)
+
+        process.terminate.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_terminate_ignores_exited_process(self, runner):
+        """Test that terminating a LISA run that has already exited is not an error."""
+        process = make_process()
+        process.terminate.side_effect = ProcessLookupError
+
+        await runner._terminate(process)
+
+        process.kill.assert_not_called()
+
+
+class TestLisaRunnerOptions:
+    """Test class for the LisaRunner constructor options."""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "runner_kwargs,expected_prefix",
+        [
+            pytest.param(
+                {"runbook": "custom/runbook.yml", "tier": 2, "test_case": "smoke_test"},
+                ["lisa", "-r", "custom/runbook.yml", "-v", "tier:2", "-v", "test_case_name:smoke_test"],
+                id="custom",
+            ),
+            pytest.param(
+                {"test_case": None},
+                ["lisa", "-r", "microsoft/runbook/azure_fedora.yml", "-v", "tier:1"],
+                id="whole-tier",
+            ),
+        ],
+    )
+    async def test_trigger_lisa_runner_options(
+        self, test_setup, mock_subproc_exec, runner_kwargs, expected_prefix
+    ):
+        """Test that the runbook, tier and test case come from the runner."""
+        runner = trigger_lisa.LisaRunner(**runner_kwargs)
+        await runner.trigger_lisa(
+            test_setup['region'], test_setup['community_gallery_image'], test_setup['config_params']
+        )
+
+        args, _ = mock_subproc_exec.call_args
+        assert list(args[:len(expected_prefix)]) == expected_prefix
+        assert args[len(expected_prefix):len(expected_prefix) + 2] == ("-v", f"region:{test_setup['region']}")
+
+    @pytest.mark.asyncio
+    async def test_run_many_passes_runner_options(self, test_setup, mock_subproc_exec):
+        """Test that run_many builds its runner with the given options."""
+        jobs = [(test_setup['region'], test_setup['community_gallery_image'], test_setup['config_params'])]
+        results = await trigger_lisa.LisaRunner.run_many(jobs, runbook="custom/runbook.yml")
+
+        assert results == [trigger_lisa.LisaResult.OK]
+        args, _ = mock_subproc_exec.call_args
+        assert args[:3] == ("lisa", "-r", "custom/runbook.yml")
+
+
+class TestLisaResult:
+    """Test class for the LisaResult returned by trigger_lisa."""
+
+    @pytest.mark.parametrize("result", list(trigger_lisa.LisaResult))
+    def test_lisa_result_truthiness(self, result):
+        """Test that only a successful result is truthy, like the old True/False return value."""
+        assert bool(result) is (result is trigger_lisa.LisaResult.OK)
+
+    @pytest.mark.parametrize("value", [0, 1, True, False])
+    def test_lisa_result_not_equal_to_plain_values(self, value):
+        """Test that results are never confused with exit codes or booleans by comparison."""
+        assert all(result != value for result in trigger_lisa.LisaResult)